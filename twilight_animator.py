@@ -1,9 +1,10 @@
-from twilight_generator import TwilightState, TwilightGenerator, interpolate_states
+from twilight_generator import TwilightState, TwilightGenerator, interpolate_values, interpolate_values_batch
 from utils import lerp, slerp
-from PySide6.QtCore import Qt, QObject, QThread, Signal, Slot
-from PySide6.QtGui import QPixmap
-from PIL import ImageQt
+from PySide6.QtCore import Qt, QObject, QThread, QMutex, QMutexLocker, QWaitCondition, Signal, Slot
+from PySide6.QtGui import QImage
 import time
+import bisect
+from collections import OrderedDict
 from typing import List, Union, Optional
 
 
@@ -43,12 +44,23 @@ class Timeline:
         self.update()
 
     def update(self, reset_start_end: bool = True):
-        """Validate and sort keyframes on timeline"""
-        self.keyframes = [kf for kf in self.keyframes if isinstance(kf, Keyframe)] # Filter out non-Keyframe objects
-        self.keyframes.sort(key=lambda kf: kf.frame_number) # Sort ascending by frame number
-        if self.keyframes and reset_start_end:
-            self.start_frame = self.keyframes[0].frame_number
-            self.end_frame = self.keyframes[-1].frame_number
+        """Validate and sort keyframes on timeline. Must be called after keyframes are modified in place."""
+        keyframes = [kf for kf in self.keyframes if isinstance(kf, Keyframe)] # Filter out non-Keyframe objects
+        keyframes.sort(key=lambda kf: kf.frame_number) # Sort ascending by frame number
+        self._publish(keyframes, [kf.frame_number for kf in keyframes], [kf.state.to_tuple() for kf in keyframes], reset_start_end)
+
+    def _publish(self, keyframes: list[Keyframe], kf_frames: list[int], kf_values: list[tuple], reset_start_end: bool = True):
+        """
+        Make new sorted keyframe lists current, with an empty memo, and move start and end frame to the first and last
+        keyframe if reset_start_end. kf_frames and kf_values hold the keyframes' frame numbers and state tuples.
+        The lists are never modified afterwards. Readers in other threads (e.g. playback) take them together with the
+        memo from self._snapshot, a single attribute, so they never see lists or memo from different keyframe versions.
+        """
+        self.keyframes = keyframes
+        self._snapshot = (keyframes, kf_frames, kf_values, {}) # The dict memoizes frame_number -> TwilightState lookups
+        if keyframes and reset_start_end:
+            self.start_frame = kf_frames[0]
+            self.end_frame = kf_frames[-1]
 
     def add_keyframe(self, keyframe: Keyframe):
         """
@@ -59,36 +71,45 @@ class Timeline:
         """
         if not isinstance(keyframe, Keyframe):
             raise ValueError("Keyframe must be of type Keyframe")
-            
+
+        # Edit copies of the current lists, they are already sorted so no full update() is needed
+        keyframes, kf_frames, kf_values = (list(items) for items in self._snapshot[:3])
+
         # Check if keyframe with same frame number exists and remove it
-        if self.keyframes:
-            for i, existing_kf in enumerate(self.keyframes):
-                if existing_kf.frame_number == keyframe.frame_number:
-                    self.keyframes.pop(i)
-                    break
-                
-        self.keyframes.append(keyframe)
-        self.update()
+        i = bisect.bisect_left(kf_frames, keyframe.frame_number)
+        if i < len(kf_frames) and kf_frames[i] == keyframe.frame_number:
+            del keyframes[i], kf_frames[i], kf_values[i]
+
+        # Insert in sorted position
+        i = bisect.bisect_right(kf_frames, keyframe.frame_number)
+        keyframes.insert(i, keyframe)
+        kf_frames.insert(i, keyframe.frame_number)
+        kf_values.insert(i, keyframe.state.to_tuple())
+        self._publish(keyframes, kf_frames, kf_values)
 
     def remove_keyframe(self, frame_number: int = None, index: int = None, keyframe: Keyframe = None):
         """
         Removes a keyframe from the timeline, identified by either frame_number, index or keyframe object. 
         """
+        # Edit copies of the current lists, see add_keyframe()
+        keyframes, kf_frames, kf_values = (list(items) for items in self._snapshot[:3])
         if isinstance(frame_number, int):
-            for i, kf in enumerate(self.keyframes):
-                if kf.frame_number == frame_number:
-                    self.keyframes.pop(i)
-                    return
-                
-        elif isinstance(index, int) and 0 <= index < len(self.keyframes):
-            self.keyframes.pop(index)
+            i = bisect.bisect_left(kf_frames, frame_number)
+            index = i if i < len(kf_frames) and kf_frames[i] == frame_number else None
 
-        elif isinstance(keyframe, Keyframe) and keyframe in self.keyframes:
-            self.keyframes.remove(keyframe)
+        elif not isinstance(index, int) and isinstance(keyframe, Keyframe) and keyframe in keyframes:
+            index = keyframes.index(keyframe)
+
+        if isinstance(index, int) and 0 <= index < len(keyframes):
+            del keyframes[index], kf_frames[index], kf_values[index]
+        self._publish(keyframes, kf_frames, kf_values)
 
     def get_state_at_frame(self, frame_number, keyframes: Optional[list[Keyframe]] = None) -> TwilightState:
         """
         Get the state at a specific frame number between keyframes.
+        Results for the timeline's own keyframes are memoized until the keyframes change, and frames at or beyond
+        the first or last keyframe return that keyframe's own state. The returned state is shared and must not be
+        modified by the caller, copy it first if needed.
 
         Parameters:
         - frame_number (int): The frame number to get the state for. Should be in the range between first and last keyframe
@@ -97,34 +118,94 @@ class Timeline:
         Returns:
         - TwilightState: The state at the specified frame number.
         """
-        # Prepare keyframes
-        if keyframes is None:
-            keyframes = self.keyframes
-        else:
-            keyframes = [kf for kf in keyframes if isinstance(kf, Keyframe)]
+        if keyframes is not None:
+            keyframes = sorted((kf for kf in keyframes if isinstance(kf, Keyframe)), key=lambda kf: kf.frame_number)
+            return self._compute_state_at_frame(frame_number, keyframes, [kf.frame_number for kf in keyframes],
+                                                [kf.state.to_tuple() for kf in keyframes])
+
+        # Work on one snapshot. If the keyframes change meanwhile, the result lands in the discarded memo
+        keyframes, kf_frames, kf_values, frame_states = self._snapshot
+        if frame_number not in frame_states:
+            frame_states[frame_number] = self._compute_state_at_frame(frame_number, keyframes, kf_frames, kf_values)
+        return frame_states[frame_number]
+
+    def precompute_frames(self, start_frame: int = None, end_frame: int = None):
+        """
+        Interpolates the states of a range of frames into the memo used by get_state_at_frame(), in one batch per
+        keyframe segment. Frames that are already memoized are kept, frames outside the keyframes need no interpolation.
+
+        Parameters:
+        - start_frame (int, optional): The first frame to compute. Defaults to the timeline's start frame.
+        - end_frame (int, optional): The last frame to compute. Defaults to the timeline's end frame.
+        """
+        snapshot = self._snapshot
+        kf_frames = snapshot[1]
+        if len(kf_frames) < 2:
+            return
+        # The first and last keyframes themselves are returned as is by get_state_at_frame, not interpolated
+        start_frame = max(self.start_frame if start_frame is None else start_frame, kf_frames[0] + 1)
+        end_frame = min(self.end_frame if end_frame is None else end_frame, kf_frames[-1] - 1)
+
+        i = max(bisect.bisect_left(kf_frames, start_frame) - 1, 0)
+        while i < len(kf_frames) - 1 and kf_frames[i] < end_frame:
+            self._interpolate_segment(snapshot, i, max(start_frame, kf_frames[i] + 1), min(end_frame, kf_frames[i + 1]))
+            i += 1
+
+    def precompute_segment(self, frame_number: int):
+        """
+        Interpolates the states from frame_number up to the end of its keyframe segment in one batch, into the memo
+        used by get_state_at_frame(). Meant for sequential access such as playback, does nothing if frame_number
+        is already memoized or lies outside the keyframes.
+
+        Parameters:
+        - frame_number (int): The first frame to compute.
+        """
+        snapshot = self._snapshot
+        _, kf_frames, _, frame_states = snapshot
+        if frame_number in frame_states or not kf_frames or not kf_frames[0] < frame_number < kf_frames[-1]:
+            return
+
+        i = min(bisect.bisect_left(kf_frames, frame_number) - 1, len(kf_frames) - 2)
+        self._interpolate_segment(snapshot, i, frame_number, min(kf_frames[i + 1], kf_frames[-1] - 1))
+
+    def _interpolate_segment(self, snapshot: tuple, index: int, first_frame: int, last_frame: int):
+        """
+        Memoize the states of the frames first_frame to last_frame that are not memoized yet, all of which must lie
+        in the segment after keyframe index (a frame on the following keyframe belongs to this segment).
+        snapshot is the self._snapshot that index and the frames were determined from.
+        """
+        _, kf_frames, kf_values, frame_states = snapshot
+        frames = [frame for frame in range(first_frame, last_frame + 1) if frame not in frame_states]
+        if not frames:
+            return
+        start_frame = kf_frames[index]
+        steps_between = kf_frames[index + 1] - start_frame
+        ts = [(frame - start_frame) / steps_between for frame in frames]
+        for frame, values in zip(frames, interpolate_values_batch(kf_values[index], kf_values[index + 1], ts)):
+            frame_states[frame] = TwilightState(*values)
+
+    def _compute_state_at_frame(self, frame_number, keyframes: list[Keyframe], kf_frames: list[int], kf_values: list[tuple]) -> TwilightState:
+        """
+        Interpolate the state at frame_number from keyframes, which must be sorted.
+        kf_frames and kf_values hold their frame numbers and state tuples.
+        """
         if not keyframes:
             return None
-        keyframes.sort(key=lambda kf: kf.frame_number)
 
-        # If frame_number is before the first keyframe
-        if frame_number <= keyframes[0].frame_number:
-            return keyframes[0].state.copy()
+        # If frame_number is before the first keyframe. Returned as is, callers treat states as read-only
+        if frame_number <= kf_frames[0]:
+            return keyframes[0].state
         # If frame_number is after the last keyframe
-        elif frame_number >= keyframes[-1].frame_number:
-            return keyframes[-1].state.copy()
+        elif frame_number >= kf_frames[-1]:
+            return keyframes[-1].state
 
         # Find the two keyframes surrounding the frame_number
-        for i in range(len(keyframes) - 1):
-            start_frame, start_state = keyframes[i].frame_number, keyframes[i].state
-            end_frame, end_state = keyframes[i + 1].frame_number, keyframes[i + 1].state
-            
-            # If frame_number is between start_frame and end_frame
-            if start_frame <= frame_number <= end_frame:
-                steps_between = end_frame - start_frame
-                t = (frame_number - start_frame) / steps_between if steps_between > 0 else 0 # Get the interpolation factor
-                interpolated_state = interpolate_states(start_state, end_state, t)
-                return interpolated_state
-        return None
+        # bisect_left, so a frame exactly on a keyframe ends the segment before it, as the linear scan did
+        i = min(bisect.bisect_left(kf_frames, frame_number) - 1, len(keyframes) - 2)
+        start_frame, end_frame = kf_frames[i], kf_frames[i + 1]
+        steps_between = end_frame - start_frame
+        t = (frame_number - start_frame) / steps_between if steps_between > 0 else 0 # Get the interpolation factor
+        return TwilightState(*interpolate_values(kf_values[i], kf_values[i + 1], t))
 
 
 class TwilightAnimator(QObject):
@@ -155,6 +236,9 @@ class TwilightAnimator(QObject):
 
         self.frame_delay = 1.0 / self.timeline.framerate
         self._is_running = False
+        # Wakes the frame delay wait when the animation is stopped
+        self._stop_mutex = QMutex()
+        self._stop_requested = QWaitCondition()
         self.next_frame = self.timeline.start_frame # Next frame number to be generated. Not last generated frame
 
     @Slot()
@@ -166,20 +250,40 @@ class TwilightAnimator(QObject):
         self._is_running = True
         try:
             self.frame_delay = 1.0 / self.timeline.framerate
+            # Pace frames by deadline, so the time spent per frame doesn't add up to a slower framerate
+            deadline = time.perf_counter()
             for frame_number, state in self.sequence_generator():
                 if not self._is_running:
                     break
                 self.frame_generated.emit(frame_number, state)
-                time.sleep(self.frame_delay)
+                deadline += self.frame_delay
+                with QMutexLocker(self._stop_mutex):
+                    remaining = deadline - time.perf_counter()
+                    if remaining < -self.frame_delay:
+                        deadline = time.perf_counter() # Fell behind by more than a frame, don't rush to catch up
+                    elif remaining > 0 and self._is_running:
+                        self._stop_requested.wait(self._stop_mutex, round(remaining * 1000))
             self.animation_finished.emit()
         finally:
             self._is_running = False
 
     def stop_animation(self):
         """
-        Stops the animation sequence.
+        Stops the animation sequence, without waiting for the current frame delay to pass.
         """
-        self._is_running = False
+        with QMutexLocker(self._stop_mutex):
+            self._is_running = False
+            self._stop_requested.wakeAll()
+
+    def set_framerate(self, fps: Union[int, float]):
+        """
+        Sets the framerate of the timeline. Takes effect from the next frame, also while the animation is running.
+
+        Parameters:
+        - fps (int or float): The new framerate.
+        """
+        self.timeline.framerate = fps
+        self.frame_delay = 1.0 / fps
 
     def set_current_frame(self, frame_number):
         """
@@ -202,6 +306,7 @@ class TwilightAnimator(QObject):
         - tuple: (frame_number (int), TwilightState instance)
         """
         while self.next_frame <= self.timeline.end_frame and self._is_running:
+            self.timeline.precompute_segment(self.next_frame) # Interpolates the rest of the segment on first entry
             state = self.timeline.get_state_at_frame(self.next_frame)
             if state:
                 yield (self.next_frame, state)
@@ -249,41 +354,266 @@ class AnimationThread(QThread):
         """
         self.animator.set_current_frame(frame_number)
 
+    def set_framerate(self, fps):
+        """
+        Sets the framerate of the animator without restarting the thread.
+
+        Parameters:
+        - fps (int or float): The new framerate.
+        """
+        self.animator.set_framerate(fps)
+
 class TwilightGeneratorThread(QThread):
-    image_ready = Signal(int, object, object)  # frame_number, state, image
+    """
+    Renders queued states in a background thread.
+    Finished images are placed in a single ready slot which the consumer empties with take_frame().
+    A newer image overwrites one that has not been taken yet, so the consumer never falls behind.
+    """
+
+    frame_ready = Signal()  # Emitted when the ready slot goes from empty to filled
+
+    CACHE_SIZE = 64 # Number of rendered images kept for reuse (about 2 MB each at 960x540)
+
+    # Decimals that continuous state values are rounded to before rendering, so near-identical states share one image.
+    # Finer than the UI sliders, which step time and angles by 0.1 and ratios by 0.01
+    QUANTIZE_DIGITS = {'time_of_day': 2, 'latitude': 1, 'longitude': 1, 'star_density': 2, 'transition_ratio': 2}
     
-    def __init__(self):
+    def __init__(self, target_width: int = None, target_height: int = None):
+        """
+        Create a generator thread.
+
+        Parameters:
+        - target_width (int, optional): Width to render images at, keeping the aspect ratio of the state. Defaults to the state's width.
+        - target_height (int, optional): Height to render images at, keeping the aspect ratio of the state. Defaults to the state's height.
+        """
         super().__init__()
+        self.target_width = target_width
+        self.target_height = target_height
         self.current_state = None
-        self.next_state = None
         self.current_frame = 0
-        self.next_frame = 0
+        self._pending = None # Latest (frame_number, state, token) job. Older jobs are dropped when overwritten
+        self._token = 0 # Token of the latest set_state() call
+        self._pending_mutex = QMutex()
+        self._pending_added = QWaitCondition() # Wakes the worker when a job is queued or the thread is stopped
+        self._prefetch = [] # States to render into the cache while there is no pending job, next one last
+        self._ready = None # Latest finished (frame_number, state, QImage) not yet taken by the consumer
+        self._ready_mutex = QMutex()
         self.running = True
         self.generator = TwilightGenerator(TwilightState())
+        self._image_cache = OrderedDict() # Rendered state tuple -> QImage, least recently used first
         
-    def set_state(self, frame_number, state):
-        self.next_frame = frame_number
-        self.next_state = state
+    def set_target_size(self, width: int, height: int):
+        """Set the size that images are rendered to fit into (keeping aspect ratio)."""
+        self.target_width = width
+        self.target_height = height
+
+    def _fit_to_target(self, state: TwilightState) -> tuple:
+        """Returns the (width, height) that state is rendered at to fit the target size (keeping aspect ratio), or None if no target is set."""
+        if not (self.target_width and self.target_height):
+            return None
+        scale = min(self.target_width / state.width, self.target_height / state.height)
+        return (max(1, round(state.width * scale)), max(1, round(state.height * scale)))
+
+    def _quantize(self, state: TwilightState) -> TwilightState:
+        """Returns a new state with the values in QUANTIZE_DIGITS rounded, the state that is actually rendered and cached."""
+        return TwilightState(*(round(value, self.QUANTIZE_DIGITS[attr]) if attr in self.QUANTIZE_DIGITS else value
+                               for attr, value in zip(TwilightState.FIELDS, state.to_tuple())))
+
+    def set_state(self, frame_number, state) -> int:
+        """
+        Queue a state for rendering, replacing any job that has not been picked up yet.
+
+        Returns:
+        - int: Token identifying this request, increasing with every call. Returned again with the finished frame.
+        """
+        with QMutexLocker(self._pending_mutex):
+            self._token += 1
+            self._pending = (frame_number, state, self._token)
+            self._pending_added.wakeOne()
+            return self._token
         
+    def prefetch(self, states: List[TwilightState]):
+        """
+        Queue states to be rendered into the cache while the thread is otherwise idle, replacing earlier prefetch requests.
+        Prefetched images are not published, they only make a later set_state() with the same state instant.
+
+        Parameters:
+        - states (list of TwilightState): The states to render, most urgent first.
+        """
+        with QMutexLocker(self._pending_mutex):
+            self._prefetch = list(reversed(states))
+            self._pending_added.wakeOne()
+
+    def take_frame(self):
+        """
+        Takes the latest finished frame out of the ready slot.
+
+        Returns:
+        - tuple: (frame_number (int), TwilightState, QImage, token (int)), or None if there is no new frame.
+          The token is the one set_state() returned for the request.
+        """
+        with QMutexLocker(self._ready_mutex):
+            frame, self._ready = self._ready, None
+        return frame
+
+    def _render(self, state: TwilightState) -> QImage:
+        """
+        Returns the image for state at the display size, from the cache if it was rendered recently.
+
+        Parameters:
+        - state (TwilightState): The state to render.
+
+        Returns:
+        - QImage: The rendered image.
+        """
+        # Key on the quantized state and the display size, so animation frames that only differ below the rounding
+        # precision share entries. The state keeps its output size, which the star layout depends on
+        render_state = self._quantize(state)
+        size = self._fit_to_target(state)
+        key = (render_state.to_tuple(), size)
+        image = self._image_cache.get(key)
+        if image is not None:
+            self._image_cache.move_to_end(key)
+            return image
+
+        # Generate image with current state, at the display size if one is set
+        self.generator.set_state(render_state, size)
+        self.generator.generate()
+
+        # Wrap the raw pixel buffer in a QImage directly, no intermediate PIL or Qt image
+        data = self.generator.get_image_bytes('RGBX')
+        width, height = self.generator.image.size
+        image = QImage(data, width, height, width * 4, QImage.Format.Format_RGBX8888)
+        # Convert here to the format QPixmap uses for opaque images, so the GUI thread can take it over unconverted.
+        # The converted image owns its pixels, so the cache doesn't hold on to the bytes object
+        image = image.convertToFormat(QImage.Format.Format_RGB32)
+
+        self._image_cache[key] = image
+        if len(self._image_cache) > self.CACHE_SIZE:
+            self._image_cache.popitem(last=False)
+        return image
+
     def run(self):
-        while self.running:
-            if self.next_state:
-                # Take next state as current
-                self.current_state = self.next_state
-                self.current_frame = self.next_frame
-                # Clear next state since we're processing it
-                self.next_state = None
+        while True:
+            # Sleep until a job or prefetch is queued, then take it. Jobs go first
+            with QMutexLocker(self._pending_mutex):
+                while self._pending is None and not self._prefetch and self.running:
+                    self._pending_added.wait(self._pending_mutex)
+                if not self.running:
+                    break
+                job, self._pending = self._pending, None
+                prefetch_state = self._prefetch.pop() if job is None else None
+
+            if job is None:
+                # Idle, render ahead into the cache without publishing
+                self._render(prefetch_state)
+                continue
+
+            self.current_frame, self.current_state, token = job
+
+            # Reuse a cached image when revisiting a state (e.g. scrubbing), otherwise render it
+            image = self._render(self.current_state)
+
+            # Publish the result. Only notify if the consumer has taken the previous one,
+            # otherwise it will pick up this newer result instead
+            with QMutexLocker(self._ready_mutex):
+                notify = self._ready is None
+                self._ready = (self.current_frame, self.current_state, image, token)
+            if notify:
+                self.frame_ready.emit()
                 
-                # Generate image with current state
-                self.generator.set_state(self.current_state)
-                self.generator.generate()
-                image = self.generator.get_image()
+    def stop(self):
+        with QMutexLocker(self._pending_mutex):
+            self.running = False
+            self._pending_added.wakeAll()
+
+
+class FrameRenderThread(QThread):
+    """
+    Renders all frames of a timeline to PIL images in a background thread, e.g. for export.
+    The rendered images are available in frames once the thread has finished.
+    """
+
+    progress = Signal(int)  # Number of frames rendered so far
 
-                # Emit the result
-                self.image_ready.emit(self.current_frame, self.current_state, image)
+    def __init__(self, timeline: Timeline, parent=None):
+        """
+        Create a frame render thread.
+
+        Parameters:
+        - timeline (Timeline): The timeline to render, from its start frame to its end frame.
+        - parent (QObject, optional): Parent object.
+        """
+        super().__init__(parent)
+        self.timeline = timeline
+        self.frames = []
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop rendering after the current frame."""
+        self.cancelled = True
+
+    def run(self):
+        # Reuse one generator, stars are only regenerated when seed, size or density change
+        generator = None
+        self.timeline.precompute_frames()
+        for frame in range(self.timeline.start_frame, self.timeline.end_frame + 1):
+            if self.cancelled:
+                return
+            state = self.timeline.get_state_at_frame(frame)
+            if state:
+                if generator is None:
+                    generator = TwilightGenerator(state)
+                else:
+                    generator.set_state(state)
+                generator.generate()
+                self.frames.append(generator.get_image())
+                self.progress.emit(frame - self.timeline.start_frame + 1)
+
+
+class ThumbnailRenderThread(QThread):
+    """
+    Renders small preview images of a batch of states in a background thread, e.g. for keyframe list icons.
+    Each image is emitted as soon as it is done, together with the key it was queued under.
+    """
+
+    thumbnail_ready = Signal(str, QImage)  # Key, rendered image in RGB32 format
+
+    def __init__(self, states: dict, width: int, height: int, parent=None):
+        """
+        Create a thumbnail render thread.
+
+        Parameters:
+        - states (dict): Key (str) -> TwilightState to render. The states must not be modified while rendering.
+        - width (int): Width that the thumbnails are fitted into (keeping aspect ratio).
+        - height (int): Height that the thumbnails are fitted into (keeping aspect ratio).
+        - parent (QObject, optional): Parent object.
+        """
+        super().__init__(parent)
+        self.states = states
+        self.width = width
+        self.height = height
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop rendering after the current thumbnail."""
+        self.cancelled = True
+
+    def run(self):
+        generator = None
+        for key, state in self.states.items():
+            if self.cancelled:
+                return
+            # Render the state itself at the thumbnail size, so the stars are laid out as in its full size render
+            scale = min(self.width / state.width, self.height / state.height)
+            size = (max(1, round(state.width * scale)), max(1, round(state.height * scale)))
+            if generator is None:
+                generator = TwilightGenerator(state, size)
             else:
-                # Sleep briefly if no work to do
-                self.msleep(1)
-                
-    def stop(self):
-        self.running = False
\ No newline at end of file
+                generator.set_state(state, size)
+            generator.generate()
+            data = generator.get_image_bytes('RGBX')
+            width, height = generator.image.size
+            # Converted copy owns its pixels, the bytes object can go
+            image = QImage(data, width, height, width * 4, QImage.Format.Format_RGBX8888).convertToFormat(QImage.Format.Format_RGB32)
+            self.thumbnail_ready.emit(key, image)
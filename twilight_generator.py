@@ -1,13 +1,15 @@
 import random
-import math
-from PIL import Image, ImageDraw, ImageQt
-from utils import clamp, lerp, slerp, lerp_color
+from PIL import Image
+from utils import clamp, lerp, slerp, lerp_color, lerp_colors
 
 class TwilightState:
     """
     Encapsulates all state variables required for generating a twilight render.
     """
 
+    # Names of the state variables, in the order of to_tuple() and of the __init__ arguments
+    FIELDS = ('width', 'height', 'seed', 'time_of_day', 'star_density', 'transition_ratio', 'latitude', 'longitude', 'render_type')
+
     # Define cyclical attributes and their cycle points
     CYCLICAL_ATTRIBUTES = {
         'time_of_day': 24.000001,   # Cycles every 24 hours
@@ -174,20 +176,27 @@ class TwilightState:
             'render_type': self.render_type
         }
 
-    def copy(self):
-        """Creates a deep copy of the TwilightState instance."""
-        return TwilightState(
-            width=self.width,
-            height=self.height,
-            seed=self.seed,
-            time_of_day=self.time_of_day,
-            star_density=self.star_density,
-            transition_ratio=self.transition_ratio,
-            latitude=self.latitude,
-            longitude=self.longitude,
-            render_type=self.render_type
+    def to_tuple(self):
+        """Returns the state variables as a hashable tuple, suitable for equality checks and cache keys."""
+        return (
+            self.width,
+            self.height,
+            self.seed,
+            self.time_of_day,
+            self.star_density,
+            self.transition_ratio,
+            self.latitude,
+            self.longitude,
+            self.render_type
         )
 
+    def copy(self):
+        """Creates an independent copy of the TwilightState instance."""
+        # All state variables are immutable and already validated, so copy them directly instead of through the setters
+        state = TwilightState.__new__(TwilightState)
+        state.__dict__.update(self.__dict__)
+        return state
+
 class TwilightGenerator:
     """
     Generates twilight wallpaper images based on the provided TwilightState.
@@ -202,19 +211,27 @@ class TwilightGenerator:
     BLACK = (0, 0, 0)
     WHITE = (255, 255, 255)
 
-    def __init__(self, state: TwilightState):
+    def __init__(self, state: TwilightState, size: tuple = None):
         """
         Initializes the TwilightGenerator with a given TwilightState.
+
+        Parameters:
+        - state (TwilightState): The state to generate.
+        - size (tuple, optional): (width, height) to render at instead of the state's size, e.g. for previews.
+          Stars are still laid out for the state's size, so the image shows the same sky as a render at full size.
         """
         self.state = state
-        self._initialize_parameters()
+        self._initialize_parameters(size)
         self._initialize_stars()
         self.image = None
-
-    def _initialize_parameters(self):
-        """Initialize parameters based on the current state."""
-        self.width = self.state.width
-        self.height = self.state.height
+        self._image_key = None # Parameters self.image was generated with, see _render_key()
+        self._star_colors = None # Star color per row, see _get_star_colors()
+        self._star_colors_key = None
+
+    def _initialize_parameters(self, size: tuple = None):
+        """Initialize parameters based on the current state, rendering at size (width, height) if given."""
+        self.width, self.height = size if size else (self.state.width, self.state.height)
+        self.star_width = self.state.width # Width the stars are laid out for
         self.seed = self.state.seed
         self.time_of_day = self.state.time_of_day
         self.star_density = self.state.star_density
@@ -226,9 +243,10 @@ class TwilightGenerator:
         # Initialize random generator with seed
         self.random_gen = random.Random(self.seed)
 
-        # Define star size ranges
-        self.size_min = max(1, int(self.width * 0.001))  # 0.1% of width
-        self.size_max = max(2, int(self.width * 0.002))  # 0.2% of width
+        # Define star size ranges. From the state's width, not the render width: the size draws share the random
+        # stream with the star positions, so any other width would lay out a different star field
+        self.size_min = max(1, int(self.star_width * 0.001))  # 0.1% of width
+        self.size_max = max(2, int(self.star_width * 0.002))  # 0.2% of width
 
     def _initialize_stars(self):
         """Generate master star lists based on the current state."""
@@ -246,7 +264,7 @@ class TwilightGenerator:
             (
                 self.random_gen.uniform(0, 1),
                 self.random_gen.uniform(0, 1),
-                self.random_gen.randint(self.size_min, self.size_max) / self.width
+                self.random_gen.randint(self.size_min, self.size_max) / self.star_width
             )
             for _ in range(max_big_stars)
         ]
@@ -259,22 +277,23 @@ class TwilightGenerator:
         self.small_stars = all_small_stars[:self.total_small_stars]
         self.big_stars = all_big_stars[:self.total_big_stars]
 
-    def set_state(self, state: TwilightState):
+    def set_state(self, state: TwilightState, size: tuple = None):
         """
         Updates the generator with a new state.
 
         Parameters:
         - state (TwilightState): The new state to apply.
+        - size (tuple, optional): (width, height) to render at instead of the state's size, see __init__().
         """
+        # The star lists only depend on seed, density and the state's width, not on the render size
         regenerate_stars = (
             self.seed != state.seed or
-            self.width != state.width or
-            self.height != state.height or
+            self.star_width != state.width or
             self.star_density != state.star_density
         )
 
         self.state = state
-        self._initialize_parameters()
+        self._initialize_parameters(size)
 
         if regenerate_stars:
             self._initialize_stars()
@@ -282,13 +301,11 @@ class TwilightGenerator:
     def _create_gradient(self) -> Image.Image:
         """
         Creates a gradient image based on the current time_of_day and transition_ratio.
+        Every row has a single opaque color, so the gradient is used directly as the base image.
 
         Returns:
-        - PIL.Image.Image: The gradient overlay.
+        - PIL.Image.Image: The RGB gradient image.
         """
-        gradient = Image.new('RGBA', (self.width, self.height), self.BLACK)
-        draw = ImageDraw.Draw(gradient)
-
         cutoff = self.height * self.transition_ratio
 
         # Map time_of_day (0-24) to a phase (0-1)
@@ -316,19 +333,15 @@ class TwilightGenerator:
             top_color = lerp_color(self.ORANGE, self.BLACK, ratio)
             bottom_color = self.BLACK
 
-        # Draw the upper gradient (top to cutoff)
-        for y in range(int(cutoff)):
-            t = y / cutoff
-            color = lerp_color(top_color, bottom_color, t)
-            draw.line([(0, y), (self.width, y)], fill=color + (255,))
-
-        # Draw the lower gradient (cutoff to bottom)
-        for y in range(int(cutoff), self.height):
-            t = (y - cutoff) / (self.height - cutoff)
-            color = lerp_color(bottom_color, self.BLACK, t)
-            draw.line([(0, y), (self.width, y)], fill=color + (255,))
+        # Row colors of the upper gradient (top to cutoff), then the lower gradient (cutoff to bottom)
+        row_colors = lerp_colors(top_color, bottom_color, [y / cutoff for y in range(int(cutoff))])
+        row_colors += lerp_colors(bottom_color, self.BLACK,
+                                  [(y - cutoff) / (self.height - cutoff) for y in range(int(cutoff), self.height)])
 
-        return gradient
+        # Every pixel of a row has the same color, so fill a one pixel wide column and stretch it to full width
+        column = Image.new('RGB', (1, self.height))
+        column.putdata(row_colors)
+        return column.resize((self.width, self.height), Image.NEAREST)
 
     def _draw_stars(self, base_image: Image.Image) -> Image.Image:
         """
@@ -340,41 +353,52 @@ class TwilightGenerator:
         Returns:
         - PIL.Image.Image: The image with stars drawn.
         """
-        draw = ImageDraw.Draw(base_image)
+        # Write pixels through the pixel access object, much cheaper per star than putpixel
+        pixels = base_image.load()
+        width, height = self.width, self.height
+        star_colors = self._get_star_colors()
 
         # Calculate shifts for flat projection
-        longitude_shift = (self.longitude / 360.0) * self.width
-        latitude_shift = (self.latitude / 360.0) * self.height
+        longitude_shift = (self.longitude / 360.0) * width
+        latitude_shift = (self.latitude / 360.0) * height
 
         # Ensure seamless repetition
-        longitude_shift %= self.width
-        latitude_shift %= self.height
+        longitude_shift %= width
+        latitude_shift %= height
 
         # Draw small stars as single pixels
         for norm_x, norm_y in self.small_stars:
-            x = int((norm_x * self.width + longitude_shift) % self.width)
-            y = int((norm_y * self.height + latitude_shift) % self.height)
-
-            color = self._get_star_color(y)
-            if 0 <= x < self.width and 0 <= y < self.height:
-                base_image.putpixel((x, self.height - y - 1), color + (255,))
+            x = int((norm_x * width + longitude_shift) % width)
+            y = int((norm_y * height + latitude_shift) % height)
+            if 0 <= x < width and 0 <= y < height:
+                pixels[x, height - y - 1] = star_colors[y]
 
         # Draw big stars as diamonds
         for norm_x, norm_y, norm_size in self.big_stars:
-            x = int((norm_x * self.width + longitude_shift) % self.width)
-            y = int((norm_y * self.height + latitude_shift) % self.height)
-            size = max(1, int(norm_size * self.width))
+            x = int((norm_x * width + longitude_shift) % width)
+            y = int((norm_y * height + latitude_shift) % height)
+            size = max(1, int(norm_size * width))
 
-            color = self._get_star_color(y)
+            color = star_colors[y]
             # Draw diamond shape
             for dx, dy in [(-size, 0), (0, -size), (size, 0), (0, size)]:
-                xi, yi = x + dx, y + dy
-                xi = clamp(xi, 0, self.width - 1)
-                yi = clamp(yi, 0, self.height - 1)
-                base_image.putpixel((xi, self.height - yi - 1), color + (255,))
+                xi = clamp(x + dx, 0, width - 1)
+                yi = clamp(y + dy, 0, height - 1)
+                pixels[xi, height - yi - 1] = color
 
         return base_image
 
+    def _get_star_colors(self) -> list[tuple[int, int, int]]:
+        """
+        Returns the star color for every row, indexed by y-coordinate.
+        Only depends on height and transition ratio, so it is kept until one of them changes.
+        """
+        key = (self.height, self.transition_ratio)
+        if key != self._star_colors_key:
+            self._star_colors = [self._get_star_color(y) for y in range(self.height)]
+            self._star_colors_key = key
+        return self._star_colors
+
     def _get_star_color(self, y: int) -> tuple[int, int, int]:
         """
         Determines the color of a star based on its y-coordinate.
@@ -407,22 +431,29 @@ class TwilightGenerator:
 
         return blended_color
 
+    def _render_key(self) -> tuple:
+        """Returns the parameters the image depends on, in the order of TwilightState.to_tuple(), then the star layout width."""
+        return (self.width, self.height, self.seed, self.time_of_day, self.star_density,
+                self.transition_ratio, self.latitude, self.longitude, self.render_type, self.star_width)
+
     def generate(self):
         """
         Generates the twilight wallpaper image based on the current state.
+        Does nothing if the image was already generated with the same parameters.
         """
-        # Create base image with black background
-        base_image = Image.new('RGBA', (self.width, self.height), self.BLACK)
+        render_key = self._render_key()
+        if self.image is not None and render_key == self._image_key:
+            return
 
-        # Apply gradient
-        gradient = self._create_gradient()
-        base_image = Image.alpha_composite(base_image, gradient)
+        # Create base image from the gradient. It covers every pixel, so no black background or compositing is needed
+        base_image = self._create_gradient()
 
         # Draw stars
         base_image = self._draw_stars(base_image)
 
         # Finalize image
-        self.image = base_image.convert('RGB')
+        self.image = base_image
+        self._image_key = render_key
 
     def get_image(self, reverse_y = True) -> Image.Image:
         """
@@ -434,10 +465,27 @@ class TwilightGenerator:
         if self.image is None:
             self.generate()
         if reverse_y:
-            return self.image.copy().transpose(Image.FLIP_TOP_BOTTOM)
+            # transpose() already returns a new image, no copy needed
+            return self.image.transpose(Image.FLIP_TOP_BOTTOM)
         else:
             return self.image.copy()
 
+    def get_image_bytes(self, rawmode: str = 'RGBX', reverse_y = True) -> bytes:
+        """
+        Returns the raw pixel data of the generated image, without creating an intermediate image.
+
+        Parameters:
+        - rawmode (str): PIL raw mode of the returned data. Defaults to 'RGBX' (4 bytes per pixel).
+        - reverse_y (bool): Whether to flip the rows, as get_image() does. Defaults to True.
+
+        Returns:
+        - bytes: Row-major pixel data, top row first.
+        """
+        if self.image is None:
+            self.generate()
+        # The raw encoder can walk the rows bottom up (ystep -1), so the flip costs no extra copy
+        return self.image.tobytes('raw', rawmode, 0, -1 if reverse_y else 1)
+
     def save_image(self, filepath: str):
         """
         Saves the generated image to a file.
@@ -463,15 +511,30 @@ def interpolate_states(state1: TwilightState, state2: TwilightState, t: float, f
     Returns:
     - TwilightState: Interpolated state.
     """
-    new_state_kwargs = {}
+    return TwilightState(*interpolate_values(state1.to_tuple(), state2.to_tuple(), t, forward))
+
+# Cycle of each field in TwilightState.FIELDS order, None for non-cyclical fields
+_FIELD_CYCLES = tuple(TwilightState.CYCLICAL_ATTRIBUTES.get(attr) for attr in TwilightState.FIELDS)
+
+def interpolate_values(values1: tuple, values2: tuple, t: float, forward: bool = True) -> tuple:
+    """
+    Interpolates between two state tuples (see TwilightState.to_tuple()) based on t.
+    Same rules as interpolate_states(), without going through TwilightState attributes.
+
+    Parameters:
+    - values1 (tuple): Starting state values.
+    - values2 (tuple): Ending state values.
+    - t (float): Interpolation factor between 0 and 1.
+    - forward (bool): Interpolation direction for cyclical attributes
 
-    for attr in state1.to_dict():
-        value1 = getattr(state1, attr)
-        value2 = getattr(state2, attr)
+    Returns:
+    - tuple: Interpolated state values, in the same order.
+    """
+    interpolated_values = []
 
+    for value1, value2, cycle in zip(values1, values2, _FIELD_CYCLES):
         # Check if the attribute is cyclical
-        if attr in TwilightState.CYCLICAL_ATTRIBUTES:
-            cycle = TwilightState.CYCLICAL_ATTRIBUTES[attr]
+        if cycle is not None:
             if forward:
                 # Calculate forward delta
                 delta = (value2 - value1) % cycle
@@ -490,8 +553,43 @@ def interpolate_states(state1: TwilightState, state2: TwilightState, t: float, f
             else:
                 interpolated_value = value1  # Retain value1 if not numeric
 
-        new_state_kwargs[attr] = interpolated_value
+        interpolated_values.append(interpolated_value)
+
+    return tuple(interpolated_values)
+
+def interpolate_values_batch(values1: tuple, values2: tuple, ts: list, forward: bool = True) -> list:
+    """
+    Interpolates between two state tuples for many values of t at once.
+    Gives the same results as calling interpolate_values() for each t, but sets up each field only once.
+
+    Parameters:
+    - values1 (tuple): Starting state values.
+    - values2 (tuple): Ending state values.
+    - ts (list of float): Interpolation factors between 0 and 1.
+    - forward (bool): Interpolation direction for cyclical attributes
+
+    Returns:
+    - list of tuple: Interpolated state values for each t, in the order of ts.
+    """
+    columns = []
+
+    for value1, value2, cycle in zip(values1, values2, _FIELD_CYCLES):
+        if cycle is not None:
+            if forward:
+                delta = (value2 - value1) % cycle
+                columns.append([(value1 + delta * t) % cycle for t in ts])
+            else:
+                delta = (value1 - value2) % cycle
+                columns.append([(value1 - delta * t) % cycle for t in ts])
+        elif isinstance(value1, (int, float)) and isinstance(value2, (int, float)):
+            if isinstance(value1, int) and isinstance(value2, int):
+                if value1 == value2:
+                    columns.append([value1] * len(ts)) # Rounds back to the same integer for any t
+                else:
+                    columns.append([int(round(lerp(value1, value2, t))) for t in ts])
+            else:
+                columns.append([lerp(value1, value2, t) for t in ts])
+        else:
+            columns.append([value1] * len(ts))  # Retain value1 if not numeric
 
-    # Create a new TwilightState instance with interpolated values
-    interpolated_state = TwilightState(**new_state_kwargs)
-    return interpolated_state
\ No newline at end of file
+    return list(zip(*columns))
@@ -1,28 +1,65 @@
 import sys
-from PIL import ImageQt
+import bisect
+from contextlib import contextmanager
 
-from twilight_generator import TwilightGenerator, TwilightState
-from twilight_animator import Keyframe, Timeline, TwilightAnimator, AnimationThread, TwilightGeneratorThread
+from twilight_generator import TwilightState
+from twilight_animator import Keyframe, Timeline, TwilightAnimator, AnimationThread, TwilightGeneratorThread, FrameRenderThread, ThumbnailRenderThread
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, QSlider, QComboBox, QPushButton,
                                QSpinBox, QListWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox,
                                QFrame, QMessageBox, QFileDialog, QProgressDialog) 
-from PySide6.QtGui import QPixmap, QPainter
-from PySide6.QtCore import Qt, Signal, Slot, QObject, QTimer
+from PySide6.QtGui import QImage, QPixmap, QPainter, QIcon, QPixmapCache
+from PySide6.QtCore import Qt, Signal, Slot, QObject, QTimer, QSignalBlocker, QEventLoop, QSize
 
 
 
 
 class MainWindow(QMainWindow):
+    # Label templates, bound once. Take the integer control units split with divmod
+    _TIME_FMT = "Time of Day: {}.{}0".format
+    _LATITUDE_FMT = "Latitude: {}.{}".format
+    _LONGITUDE_FMT = "Longitude: {}.{}".format
+    _DENSITY_FMT = "Star Density: {}.{:02d}".format
+    _TRANSITION_FMT = "Transition Ratio: {}.{:02d}".format
+    _FRAME_FMT = "Current Frame: {}".format
+    _FPS_FMT = "Framerate: {} FPS".format
+    # Keyframe list row, from the frame number and the keyframe's state values
+    _KEYFRAME_FMT = "Frame {}: Time={:.2f}, Lat={:.1f}, Lon={:.1f}, Density={:.2f}, Transition={:.2f}".format
+
+    # Minimum time between render dispatches while dragging: parameter sliders (about 60 per second) and frame scrubbing
+    _INPUT_INTERVAL_MS = 16
+    _SEEK_INTERVAL_MS = 50
+    # Size that keyframe list thumbnails are fitted into
+    _THUMBNAIL_SIZE = (64, 36)
+
     def __init__(self):
         super().__init__()
 
+        # Black letterbox background for the preview, rebuilt only when the label size changes
+        self._bg_pixmap = None
+        # (frame_number, state tuple) of the image currently shown in the preview
+        self._last_state_key = None
+        # Token of the latest render request sent to the generator thread
+        self._render_token = 0
+        # Keyframes and texts currently shown in the keyframe list, one per row
+        self._kf_rows = []
+        self._kf_text_cache = []
+        # Thumbnail cache keys of the icons in the keyframe list, one per row. Set when queued, before the image is ready
+        self._kf_icon_keys = []
+        # Thumbnail cache key -> state, waiting for the next thumbnail render thread
+        self._thumbnail_queue = {}
+        self._thumbnail_thread = None
+        # (width, height, seed, render_type) last applied to all keyframes
+        self._last_shared_settings = None
+        # Control values (see _read_input_values) of the last render dispatch or of the last displayed image
+        self._input_values = None
+
         # Setup UI elements
         self.setup_ui()
 
         # Initialize TwilightState and TwilightGenerator
-        self.generator_thread = TwilightGeneratorThread()
-        self.generator_thread.image_ready.connect(self.on_image_ready)
+        self.generator_thread = TwilightGeneratorThread(self.image_label.width(), self.image_label.height())
+        self.generator_thread.frame_ready.connect(self.on_frame_ready)
         self.generator_thread.start()
 
         # Timeline and Keyframes storage
@@ -35,11 +72,31 @@ class MainWindow(QMainWindow):
         self.animator.frame_generated.connect(self.on_frame_generated, Qt.QueuedConnection)
         self.animator.animation_finished.connect(self.on_animation_finished, Qt.QueuedConnection)
 
+        # Coalesces bursts of input changes (e.g. slider drags) into at most one render dispatch per interval
+        self._pending_timer = QTimer(self)
+        self._pending_timer.setSingleShot(True)
+        self._pending_timer.setInterval(MainWindow._INPUT_INTERVAL_MS)
+        self._pending_timer.timeout.connect(self._do_input_changed)
+
+        # Same for frame slider scrubbing, at most one seek per interval while dragging
+        self._seek_timer = QTimer(self)
+        self._seek_timer.setSingleShot(True)
+        self._seek_timer.setInterval(MainWindow._SEEK_INTERVAL_MS)
+        self._seek_timer.timeout.connect(self._do_seek)
+
+        # Keyframe frame number edits wait here until the timeline is re-sorted, so repeated edits sort once
+        self._pending_keyframe_frames = {}
+        self._timeline_update_timer = QTimer(self)
+        self._timeline_update_timer.setSingleShot(True)
+        self._timeline_update_timer.setInterval(50)
+        self._timeline_update_timer.timeout.connect(self._commit_timeline_update)
+
         # Connect signals and slots
         self.setup_connections()
 
-        # Trigger input change for initial state and image generation
-        self.on_input_changed()
+        # Trigger input change for initial state and image generation. Not deferred, so twilight_state exists right away
+        self.update_labels()
+        self._do_input_changed()
 
     def setup_ui(self):
         self.setWindowTitle("Twilight Wallpaper Controller")
@@ -151,6 +208,7 @@ class MainWindow(QMainWindow):
         self.remove_kf_button = QPushButton("Remove Keyframe")
         self.set_frame_button = QPushButton("Set Frame for Selected Keyframe")
         self.kf_list_widget = QListWidget()
+        self.kf_list_widget.setIconSize(QSize(*MainWindow._THUMBNAIL_SIZE))
 
         self.keyframe_layout.addWidget(QLabel("Frame Number:"))
         self.keyframe_layout.addWidget(self.kf_frame_input)
@@ -203,10 +261,12 @@ class MainWindow(QMainWindow):
         self.longitude_slider.valueChanged.connect(self.on_input_changed)
         self.density_slider.valueChanged.connect(self.on_input_changed)
         self.transition_slider.valueChanged.connect(self.on_input_changed)
-        self.render_combo.currentTextChanged.connect(self.on_input_changed)
-        self.seed_apply_button.clicked.connect(self.on_input_changed)
-        self.width_input.valueChanged.connect(self.on_input_changed)
-        self.height_input.valueChanged.connect(self.on_input_changed)
+        for slider in (self.time_slider, self.latitude_slider, self.longitude_slider, self.density_slider, self.transition_slider):
+            slider.sliderReleased.connect(self.on_input_slider_released)
+        self.render_combo.currentTextChanged.connect(self.on_shared_setting_changed)
+        self.seed_apply_button.clicked.connect(self.on_shared_setting_changed)
+        self.width_input.valueChanged.connect(self.on_shared_setting_changed)
+        self.height_input.valueChanged.connect(self.on_shared_setting_changed)
 
         # Keyframe management
         self.add_kf_button.clicked.connect(self.add_keyframe)
@@ -218,20 +278,69 @@ class MainWindow(QMainWindow):
         self.fps_slider.valueChanged.connect(self.on_fps_changed)
         self.play_button.clicked.connect(self.toggle_play)
         self.frame_slider.valueChanged.connect(self.on_frame_slider_changed)
+        self.frame_slider.sliderReleased.connect(self.on_frame_slider_released)
         self.save_animation_button.clicked.connect(self.save_animation)
 
     def on_input_changed(self):
-        # Read all current parameter values from UI controls
+        # A signal that leaves every control at its last dispatched value (e.g. re-emitted combo text) changes nothing
+        if not self._pending_timer.isActive() and self._read_input_values() == self._input_values:
+            return
+        # Labels follow the controls right away, the render is throttled.
+        # The timer is not restarted while active, so a continuous drag still renders every interval,
+        # and the values read when it fires are always the latest ones.
+        self.update_labels()
+        if not self._pending_timer.isActive():
+            self._pending_timer.start()
+
+    def on_input_slider_released(self):
+        # Render the final value of a drag without waiting for the throttle
+        if self._pending_timer.isActive():
+            self._pending_timer.stop()
+            self._do_input_changed()
+
+    def on_shared_setting_changed(self):
+        # Size, seed and render type are shared by all keyframes, so only these controls walk the keyframes
+        self.apply_shared_settings()
+        self.on_input_changed()
+
+    def apply_shared_settings(self):
+        '''Update size, seed and render type for all keyframes, only when one of them changed.'''
         width = self.width_input.value()
         height = self.height_input.value()
         seed = self.seed_input.value()
-        star_density = self.density_slider.value() / 100.0  # 0 to 100, represents 0.0 to 1.0
-        transition_ratio = self.transition_slider.value() / 100.0  # 5 to 50, represents 0.05 to 0.5
-        time_of_day = self.time_slider.value() / 10.0
-        latitude = self.latitude_slider.value() / 10.0  # 0 to 360.0 degrees
-        longitude = self.longitude_slider.value() / 10.0
         render_type = self.render_combo.currentText().lower()
-        fps = self.fps_slider.value()
+        shared_settings = (width, height, seed, render_type)
+        if shared_settings == self._last_shared_settings:
+            return
+        # Replace each state with an edited copy instead of editing it in place. The timeline hands keyframe states
+        # out as they are, so the old ones may still be queued or displayed in the generator thread
+        for keyframe in self.timeline.keyframes:
+            state = keyframe.state.copy()
+            state.width = width
+            state.height = height
+            state.seed = seed
+            state.render_type = render_type
+            keyframe.state = state
+        self.timeline.update() # Keyframe states changed, drop memoized frame states
+        self._last_shared_settings = shared_settings
+        self.update_keyframe_icons()
+
+    def _do_input_changed(self):
+        self.timeline.framerate = self.fps_slider.value()
+
+        # Read all current parameter values from UI controls, in their integer control units.
+        # Nothing to do if no control changed since the last dispatch or displayed image
+        input_values = self._read_input_values()
+        if input_values == self._input_values:
+            return
+        self._input_values = input_values
+        _, time_units, latitude_units, longitude_units, density_units, transition_units, width, height, seed, _ = input_values
+        star_density = density_units / 100.0  # 0 to 100, represents 0.0 to 1.0
+        transition_ratio = transition_units / 100.0  # 5 to 50, represents 0.05 to 0.5
+        time_of_day = time_units / 10.0
+        latitude = latitude_units / 10.0  # 0 to 360.0 degrees
+        longitude = longitude_units / 10.0
+        render_type = self.render_combo.currentText().lower()
 
         # Update labels
         self.update_labels()
@@ -249,17 +358,25 @@ class MainWindow(QMainWindow):
         self.twilight_state.latitude = latitude
         self.twilight_state.longitude = longitude
         self.twilight_state.render_type = render_type
-        self.timeline.framerate = fps
-
-        # Update render type for all keyframes
-        for keyframe in self.timeline.keyframes:
-            keyframe.state.width = width
-            keyframe.state.height = height
-            keyframe.state.seed = seed
-            keyframe.state.render_type = render_type
 
         # Update TwilightGenerator's state. Wil emit a signal when done, which will update the image and ui
-        self.generator_thread.set_state(self.frame_slider.value(), self.twilight_state)
+        # Pass a snapshot so later UI edits don't alter the state the image is reported for.
+        self._render_token = self.generator_thread.set_state(input_values[0], self.twilight_state.copy())
+
+    def _read_input_values(self):
+        '''Returns the frame and all parameter control values as a tuple of ints, in the controls' own units.'''
+        return (
+            self.frame_slider.value(),
+            self.time_slider.value(),
+            self.latitude_slider.value(),
+            self.longitude_slider.value(),
+            self.density_slider.value(),
+            self.transition_slider.value(),
+            self.width_input.value(),
+            self.height_input.value(),
+            self.seed_input.value(),
+            self.render_combo.currentIndex()
+        )
 
     def add_keyframe(self):
         frame_number = self.kf_frame_input.value()
@@ -268,13 +385,151 @@ class MainWindow(QMainWindow):
         self.timeline.add_keyframe(new_keyframe)
         self.update_keyframes_list()
         self.update_frame_slider_range()
+        # Render keyframe states into the preview cache while idle, so seeking to a keyframe is instant
+        self.generator_thread.prefetch([keyframe.state.copy() for keyframe in self.timeline.keyframes])
 
     def update_keyframes_list(self):
-        self.kf_list_widget.clear()
-        for keyframe in self.timeline.keyframes:
-            state = keyframe.state
-            item_text = f"Frame {keyframe.frame_number}: Time={state.time_of_day:.2f}, Lat={state.latitude:.1f}, Lon={state.longitude:.1f}, Density={state.star_density:.2f}, Transition={state.transition_ratio:.2f}"
-            self.kf_list_widget.addItem(item_text)
+        # Each keyframe keeps its list item. Only rows of added, removed, moved or changed keyframes are touched
+        keyframes = self.timeline.keyframes
+        texts = [self.keyframe_text(keyframe) for keyframe in keyframes]
+        rows, shown, icon_keys = self._kf_rows, self._kf_text_cache, self._kf_icon_keys
+        if keyframes == rows and texts == shown:
+            self.update_keyframe_icons()
+            return
+        # Repaint once after all row changes, and keep intermediate selection changes from reaching on_keyframe_selected
+        self.kf_list_widget.setUpdatesEnabled(False)
+        blocker = QSignalBlocker(self.kf_list_widget)
+        try:
+            # Keyframes whose rows are already in the new order stay in place, all others are taken out to be reinserted
+            positions = {keyframe: index for index, keyframe in enumerate(keyframes)}
+            staying = self._ordered_subset([positions.get(keyframe, -1) for keyframe in rows])
+            # Read before taking any row, Qt may move the selection of a taken row to the next one to be taken
+            selected_rows = {self.kf_list_widget.row(item) for item in self.kf_list_widget.selectedItems()}
+            taken = {}
+            removed_selected = False
+            for row in range(len(rows) - 1, -1, -1):
+                if row not in staying:
+                    selected = row in selected_rows
+                    item = self.kf_list_widget.takeItem(row)
+                    if rows[row] in positions: # Moved, not removed
+                        taken[rows[row]] = (item, selected, shown[row], icon_keys[row])
+                    elif selected:
+                        removed_selected = True
+                    del rows[row], shown[row], icon_keys[row]
+            if removed_selected:
+                # Qt hands the selection of a removed row on to a neighbouring one, without the signal that would load
+                # that keyframe into the controls. Leave nothing selected instead, as the controls still show the removed one
+                self.kf_list_widget.setCurrentRow(-1)
+                self.kf_list_widget.clearSelection()
+            # Reinsert moved items and add new ones at their sorted rows, then refresh changed texts
+            for row, (keyframe, text) in enumerate(zip(keyframes, texts)):
+                if row == len(rows) or rows[row] is not keyframe:
+                    if keyframe in taken:
+                        item, selected, shown_text, icon_key = taken[keyframe]
+                        self.kf_list_widget.insertItem(row, item)
+                        item.setSelected(selected)
+                    else:
+                        shown_text, icon_key = text, None
+                        self.kf_list_widget.insertItem(row, text)
+                    rows.insert(row, keyframe)
+                    shown.insert(row, shown_text)
+                    icon_keys.insert(row, icon_key)
+                if shown[row] != text:
+                    self.kf_list_widget.item(row).setText(text)
+                    shown[row] = text
+        finally:
+            blocker.unblock()
+            self.kf_list_widget.setUpdatesEnabled(True)
+        self.update_keyframe_icons()
+
+    @staticmethod
+    def _ordered_subset(positions):
+        '''Returns the indices of a longest strictly increasing run (not necessarily contiguous) in positions, ignoring negative ones.
+        Those rows are already in order relative to each other, so only the remaining rows need to move.'''
+        tails = [] # tails[k]: index in positions of the smallest last element of an increasing run of length k + 1
+        tail_positions = [] # positions[tails[k]], for bisecting
+        previous = [None] * len(positions)
+        for index, position in enumerate(positions):
+            if position < 0:
+                continue
+            k = bisect.bisect_left(tail_positions, position)
+            previous[index] = tails[k - 1] if k else None
+            if k == len(tails):
+                tails.append(index)
+                tail_positions.append(position)
+            else:
+                tails[k] = index
+                tail_positions[k] = position
+        subset = set()
+        index = tails[-1] if tails else None
+        while index is not None:
+            subset.add(index)
+            index = previous[index]
+        return subset
+
+    def thumbnail_key(self, state):
+        '''QPixmapCache key of the keyframe thumbnail for state.'''
+        return f"twilight_thumbnail:{state.to_tuple()}"
+
+    def update_keyframe_icons(self):
+        '''Show a thumbnail of each keyframe's state in its list row. Cached thumbnails are reused, missing ones are rendered in the background.'''
+        keys = [self.thumbnail_key(keyframe.state) for keyframe in self.timeline.keyframes]
+        shown = self._kf_icon_keys
+        if keys == shown:
+            return
+        for row, (key, keyframe) in enumerate(zip(keys, self.timeline.keyframes)):
+            if row < len(shown) and shown[row] == key:
+                continue
+            pixmap = QPixmapCache.find(key)
+            if pixmap is None:
+                self._thumbnail_queue[key] = keyframe.state.copy()
+                self.kf_list_widget.item(row).setIcon(QIcon()) # Until the thumbnail is ready
+            else:
+                self.kf_list_widget.item(row).setIcon(QIcon(pixmap))
+        self._kf_icon_keys = keys
+        self._start_thumbnail_render()
+
+    def _start_thumbnail_render(self):
+        '''Render the queued thumbnails that are still shown and not cached, unless a render thread is already busy.'''
+        if self._thumbnail_thread is not None:
+            return # Picks up the queue when finished
+        states = {key: state for key, state in self._thumbnail_queue.items()
+                  if key in self._kf_icon_keys and QPixmapCache.find(key) is None}
+        self._thumbnail_queue = {}
+        if not states:
+            return
+        self._thumbnail_thread = ThumbnailRenderThread(states, *MainWindow._THUMBNAIL_SIZE, self)
+        self._thumbnail_thread.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self._thumbnail_thread.finished.connect(self._on_thumbnail_thread_finished)
+        self._thumbnail_thread.start()
+
+    def _on_thumbnail_thread_finished(self):
+        self._thumbnail_thread.deleteLater()
+        self._thumbnail_thread = None
+        self._start_thumbnail_render()
+
+    def on_thumbnail_ready(self, key: str, image: QImage):
+        pixmap = QPixmap.fromImage(image, Qt.ImageConversionFlag.NoFormatConversion)
+        QPixmapCache.insert(key, pixmap)
+        icon = QIcon(pixmap)
+        for row, row_key in enumerate(self._kf_icon_keys):
+            if row_key == key:
+                self.kf_list_widget.item(row).setIcon(icon)
+
+    def update_single_keyframe_row(self, index):
+        '''Refresh the text of one keyframe row, for edits that don't add, remove or reorder keyframes.'''
+        if len(self._kf_text_cache) != len(self.timeline.keyframes):
+            self.update_keyframes_list() # List is out of sync, rows may not match keyframes
+            return
+        text = self.keyframe_text(self.timeline.keyframes[index])
+        if self._kf_text_cache[index] != text:
+            self._kf_text_cache[index] = text
+            self.kf_list_widget.item(index).setText(text) # Same keyframe, so its selection stays
+
+    def keyframe_text(self, keyframe):
+        state = keyframe.state
+        return MainWindow._KEYFRAME_FMT(keyframe.frame_number, state.time_of_day, state.latitude, state.longitude,
+                                        state.star_density, state.transition_ratio)
 
     def update_frame_slider_range(self):
         if self.timeline.keyframes:
@@ -301,11 +556,28 @@ class MainWindow(QMainWindow):
         frame_number = self.kf_frame_input.value()
         item = selected_items[0]
         index = self.kf_list_widget.row(item)
-        # Update the frame number for the selected keyframe
-        self.timeline.keyframes[index].frame_number = frame_number
+        # Queue the frame number for the selected keyframe, applied together with the sort
+        self._pending_keyframe_frames[self.timeline.keyframes[index]] = frame_number
+        self._schedule_timeline_update()
+
+    def _schedule_timeline_update(self):
+        # (Re)start the timer, so a burst of edits results in one commit
+        self._timeline_update_timer.start()
+
+    def _commit_timeline_update(self):
+        pending, self._pending_keyframe_frames = self._pending_keyframe_frames, {}
+        for keyframe, frame_number in pending.items():
+            if keyframe in self.timeline.keyframes: # May have been removed meanwhile
+                keyframe.frame_number = frame_number
+        # A single edited keyframe usually keeps its position, then only its row needs new text
+        dirty_keyframe = next(iter(pending)) if len(pending) == 1 else None
+        dirty_index = self.timeline.keyframes.index(dirty_keyframe) if dirty_keyframe in self.timeline.keyframes else None
         self.timeline.update() # Sort
         # Update keyframes list widget
-        self.update_keyframes_list()
+        if dirty_index is not None and self.timeline.keyframes[dirty_index] is dirty_keyframe:
+            self.update_single_keyframe_row(dirty_index)
+        else:
+            self.update_keyframes_list()
         # Update frame slider range
         self.update_frame_slider_range()
 
@@ -316,40 +588,26 @@ class MainWindow(QMainWindow):
         item = selected_items[0]
         index = self.kf_list_widget.row(item)
         keyframe = self.timeline.keyframes[index]
-        # Update UI controls with state parameters
-        self.kf_frame_input.setValue(keyframe.frame_number)
+        # Update UI controls with state parameters, showing a not yet committed frame number if there is one
+        self.kf_frame_input.setValue(self._pending_keyframe_frames.get(keyframe, keyframe.frame_number))
         # Update sliders
-        self.block_ui_signals(True)
-        self.time_slider.setValue(int(keyframe.state.time_of_day * 10))
-        self.latitude_slider.setValue(int(keyframe.state.latitude * 10))
-        self.longitude_slider.setValue(int(keyframe.state.longitude * 10))
-        self.density_slider.setValue(int(keyframe.state.star_density * 100))
-        self.transition_slider.setValue(int(keyframe.state.transition_ratio * 100))
-        render_type_index = self.render_combo.findText(keyframe.state.render_type.capitalize())
-        if render_type_index != -1:
-            self.render_combo.setCurrentIndex(render_type_index)
-        self.frame_slider.setValue(int(keyframe.frame_number))
-        self.block_ui_signals(False)
+        self._set_controls(keyframe.state, int(keyframe.frame_number))
         # Update labels (this will also update the TwilightState and image)
         self.on_input_changed()
 
     def on_fps_changed(self):
         fps = self.fps_slider.value()
-        self.fps_value_label.setText(f"Framerate: {fps} FPS")
+        self._set_text(self.fps_value_label, MainWindow._FPS_FMT(fps))
         if self.animation_thread:
-            if self.animation_thread.isRunning():
-                self.animation_thread.stop()
-                self.timeline.framerate = fps
-                self.animator.set_current_frame(self.frame_slider.value())
-                self.animation_thread.start()
-            else:
-                self.timeline.framerate = fps
+            # Picked up by the animation loop from the next frame on, no need to restart a running thread
+            self.animation_thread.set_framerate(fps)
+            if not self.animation_thread.isRunning():
                 self.animator.set_current_frame(self.frame_slider.value())
 
     def toggle_play(self):
         if self.animation_thread and self.animation_thread.isRunning():
             self.animation_thread.stop()
-            self.play_button.setText("Play")
+            self._set_text(self.play_button, "Play")
         else:
             if len(self.timeline.keyframes) < 2:
                 self.show_warning("At least two keyframes are required to start animation.")
@@ -357,90 +615,133 @@ class MainWindow(QMainWindow):
             if self.frame_slider.value() >= self.timeline.end_frame:
                 self.frame_slider.setValue(self.timeline.start_frame)
             self.timeline.framerate = self.fps_slider.value()
+            self._seek_timer.stop() # Seeking directly below, a deferred seek would restart playback
             self.animator.set_current_frame(self.frame_slider.value())
-            self.play_button.setText("Pause")
+            self._set_text(self.play_button, "Pause")
             self.animation_thread.start()
 
-    @Slot(int, object, object)
-    def on_image_ready(self, frame_number, state, image):
-        # Convert PIL Image to QImage and QPixmap at original dimensions
-        qt_image = ImageQt.ImageQt(image)
-        pixmap = QPixmap.fromImage(qt_image)
-        
-        # Calculate scaling ratios
-        width_ratio = self.image_label.width() / pixmap.width()
-        height_ratio = self.image_label.height() / pixmap.height()
-        scale_ratio = min(width_ratio, height_ratio)
-        
-        # Scale image maintaining aspect ratio
-        new_width = int(pixmap.width() * scale_ratio)
-        new_height = int(pixmap.height() * scale_ratio)
-        
-        scaled_pixmap = pixmap.scaled(new_width, new_height,
-                                    Qt.AspectRatioMode.KeepAspectRatio,
-                                    Qt.TransformationMode.SmoothTransformation)
-        
+    @Slot()
+    def on_frame_ready(self):
+        # Display only the newest finished frame; older ones were overwritten in the generator thread
+        frame = self.generator_thread.take_frame()
+        if frame:
+            self.on_image_ready(*frame)
+
+    def on_image_ready(self, frame_number: int, state: TwilightState, image: QImage, token: int = None):
+        '''Display a finished frame. Images cross threads as QImage; the QPixmap is only ever created here, on the GUI thread.
+        token is the generator thread's request token, frames of superseded requests are shown without syncing the controls.'''
+        # Skip conversion and repaint if the preview already shows this frame and state
+        state_key = (frame_number, state.to_tuple())
+        if state_key == self._last_state_key:
+            return
+        self._last_state_key = state_key
+
+        # Image arrives as a QImage rendered at a size that fits the label by the generator thread,
+        # already in the pixmap's RGB32 format
+        pixmap = QPixmap.fromImage(image, Qt.ImageConversionFlag.NoFormatConversion)
+
+        # Image already fills the label (the usual case for 16:9 sizes), no letterboxing needed
+        if pixmap.size() == self.image_label.size():
+            self._show_pixmap(pixmap, state, frame_number, token)
+            return
+
         # Center the image in the label
-        x_offset = (self.image_label.width() - new_width) // 2
-        y_offset = (self.image_label.height() - new_height) // 2
+        x_offset = (self.image_label.width() - pixmap.width()) // 2
+        y_offset = (self.image_label.height() - pixmap.height()) // 2
         
-        # Create background pixmap
-        result_pixmap = QPixmap(self.image_label.size())
-        result_pixmap.fill(Qt.GlobalColor.black)
+        # Reuse cached background pixmap unless the label size changed
+        if self._bg_pixmap is None or self._bg_pixmap.size() != self.image_label.size():
+            self._bg_pixmap = QPixmap(self.image_label.size())
+            self._bg_pixmap.fill(Qt.GlobalColor.black)
+        result_pixmap = QPixmap(self._bg_pixmap)
         
         # Paint scaled image onto centered background
         painter = QPainter(result_pixmap)
-        painter.drawPixmap(x_offset, y_offset, scaled_pixmap)
+        painter.drawPixmap(x_offset, y_offset, pixmap)
         painter.end()
         
-        self.image_label.setPixmap(result_pixmap)
+        self._show_pixmap(result_pixmap, state, frame_number, token)
+
+    def _show_pixmap(self, pixmap: QPixmap, state: TwilightState, frame_number: int, token: int = None):
+        self.image_label.setPixmap(pixmap)
+        # Leave the controls alone while newer input is waiting for its timer or a newer request is being rendered,
+        # they would be set back to an older state otherwise
+        if self._pending_timer.isActive() or self._seek_timer.isActive():
+            return
+        if token is not None and token != self._render_token:
+            return
         self.update_ui_from_state(state, frame_number)
+        # The controls now show the rendered state, so re-reading them is not a change
+        self._input_values = self._read_input_values()
 
     @Slot(int, TwilightState)
     def on_frame_generated(self, frame_number, state):
         """Bridge over to self.generator_thread.set_state(). No additional actions as of now."""
         # # Update UI which updates TwilightGenerator's state and renders image
         # self.update_ui_from_state(state=state, frame_number=frame_number)
-        self.generator_thread.set_state(frame_number, state)
+        self._render_token = self.generator_thread.set_state(frame_number, state)
+        # Render up to two seconds ahead while idle, so upcoming frames are cache hits rather than waiting for a render
+        if self.animation_thread.isRunning():
+            ahead = min(2 * self.fps_slider.value(), TwilightGeneratorThread.CACHE_SIZE // 2)
+            last_frame = min(frame_number + ahead, self.timeline.end_frame)
+            self.generator_thread.prefetch([self.timeline.get_state_at_frame(frame) for frame in range(frame_number + 1, last_frame + 1)])
 
     def on_animation_finished(self):
-        self.play_button.setText("Play")
+        self._set_text(self.play_button, "Play")
 
     def on_frame_slider_changed(self):
+        # Update the label right away, but throttle seeks. The timer reads the latest slider position when it fires
+        self._set_text(self.current_frame_label, MainWindow._FRAME_FMT(self.frame_slider.value()))
+        if not self._seek_timer.isActive():
+            self._seek_timer.start()
+
+    def on_frame_slider_released(self):
+        # Show the final position of a drag without waiting for the throttle
+        self._seek_timer.stop()
+        self._do_seek()
+
+    def _do_seek(self):
         frame_number = self.frame_slider.value()
-        self.current_frame_label.setText(f"Current Frame: {frame_number}")
         state = self.timeline.get_state_at_frame(frame_number)
         if state:
             if not self.animation_thread.isRunning():
-                self.generator_thread.set_state(frame_number, state)
+                # The timeline state replaces the controls' values, so a parameter dispatch still waiting would be stale
+                self._pending_timer.stop()
+                self._render_token = self.generator_thread.set_state(frame_number, state)
             self.animator.set_current_frame(frame_number)
-        else:
+        elif __debug__: # Diagnostic only, compiled out under python -O
             print(f"No state found for frame {frame_number}")
 
     def update_labels(self):
-        # Get values from sliders
-        time_of_day = self.time_slider.value() / 10.0
-        latitude = self.latitude_slider.value() / 10.0
-        longitude = self.longitude_slider.value() / 10.0
-        star_density = self.density_slider.value() / 100.0
-        transition_ratio = self.transition_slider.value() / 100.0
+        # Get values from sliders, in integer slider units
+        time_units = self.time_slider.value()
+        latitude_units = self.latitude_slider.value()
+        longitude_units = self.longitude_slider.value()
+        density_units = self.density_slider.value()
+        transition_units = self.transition_slider.value()
         frame_number = self.frame_slider.value()
         fps = self.fps_slider.value()
 
-        # Update all labels with formatted values
-        self.time_label.setText(f"Time of Day: {time_of_day:.2f}")
-        self.latitude_label.setText(f"Latitude: {latitude:.1f}")
-        self.longitude_label.setText(f"Longitude: {longitude:.1f}")
-        self.density_label.setText(f"Star Density: {star_density:.2f}")
-        self.transition_label.setText(f"Transition Ratio: {transition_ratio:.2f}")
-        self.current_frame_label.setText(f"Current Frame: {frame_number}")
-        self.fps_value_label.setText(f"Framerate: {fps} FPS")
+        # Update all labels with formatted values. Formatted from the integer units directly, no float round trip
+        self._set_text(self.time_label, MainWindow._TIME_FMT(*divmod(time_units, 10)))
+        self._set_text(self.latitude_label, MainWindow._LATITUDE_FMT(*divmod(latitude_units, 10)))
+        self._set_text(self.longitude_label, MainWindow._LONGITUDE_FMT(*divmod(longitude_units, 10)))
+        self._set_text(self.density_label, MainWindow._DENSITY_FMT(*divmod(density_units, 100)))
+        self._set_text(self.transition_label, MainWindow._TRANSITION_FMT(*divmod(transition_units, 100)))
+        self._set_text(self.current_frame_label, MainWindow._FRAME_FMT(frame_number))
+        self._set_text(self.fps_value_label, MainWindow._FPS_FMT(fps))
 
         # Animation
         if self.animation_thread and self.animation_thread.isRunning():
-            self.play_button.setText("Pause")
+            self._set_text(self.play_button, "Pause")
         else:
-            self.play_button.setText("Play")
+            self._set_text(self.play_button, "Play")
+
+    def _set_text(self, widget, text):
+        # Only touch the widget when its text actually changes, setText causes a relayout even for equal text.
+        # Compared with the widget itself, so texts set elsewhere (e.g. in setup_ui) are accounted for
+        if widget.text() != text:
+            widget.setText(text)
 
     def update_ui_from_state(self, state = None, frame_number = None):
         '''If state give, set it as current state. Else use the already set state. 
@@ -448,7 +749,8 @@ class MainWindow(QMainWindow):
         When giving as argument, frame number should correspond to state.'''
         # If state is not given, use the already set state
         if isinstance(state, TwilightState):
-            self.twilight_state = state
+            # Keep a private copy, since twilight_state is edited in place and timeline states are shared
+            self.twilight_state = state.copy()
         else:
             state = self.twilight_state
 
@@ -459,30 +761,37 @@ class MainWindow(QMainWindow):
             frame_number = self.last_generated_frame
 
         # Update UI controls with state parameters
-        self.block_ui_signals(True)
-        self.time_slider.setValue(int(state.time_of_day * 10))
-        self.latitude_slider.setValue(int(state.latitude * 10))
-        self.longitude_slider.setValue(int(state.longitude * 10))
-        self.density_slider.setValue(int(state.star_density * 100))
-        self.transition_slider.setValue(int(state.transition_ratio * 100))
-        render_type_index = self.render_combo.findText(state.render_type.capitalize())
-        if render_type_index != -1:
-            self.render_combo.setCurrentIndex(render_type_index)
-        self.current_frame_label.setText(f"Current Frame: {frame_number}")
-        self.frame_slider.setValue(frame_number)
-        self.block_ui_signals(False)
+        self._set_controls(state, frame_number)
+        self._set_text(self.current_frame_label, MainWindow._FRAME_FMT(frame_number))
 
         # Update labels
         self.update_labels()
 
-    def block_ui_signals(self, block):
-        self.time_slider.blockSignals(block)
-        self.latitude_slider.blockSignals(block)
-        self.longitude_slider.blockSignals(block)
-        self.density_slider.blockSignals(block)
-        self.transition_slider.blockSignals(block)
-        self.render_combo.blockSignals(block)
-        self.frame_slider.blockSignals(block)
+    def _set_controls(self, state, frame_number):
+        '''Set the parameter sliders, render type and frame slider to state and frame_number without emitting signals.
+        Sliders and combo box skip values they already hold, and Qt merges the repaints of all controls into one pass.'''
+        with self._silent():
+            self.time_slider.setValue(int(state.time_of_day * 10))
+            self.latitude_slider.setValue(int(state.latitude * 10))
+            self.longitude_slider.setValue(int(state.longitude * 10))
+            self.density_slider.setValue(int(state.star_density * 100))
+            self.transition_slider.setValue(int(state.transition_ratio * 100))
+            render_type_index = self.render_combo.findText(state.render_type.capitalize())
+            if render_type_index != -1:
+                self.render_combo.setCurrentIndex(render_type_index)
+            self.frame_slider.setValue(frame_number)
+
+    @contextmanager
+    def _silent(self):
+        """Blocks signals of the parameter and frame controls while they are set programmatically. Restored on exit, even on error."""
+        blockers = [QSignalBlocker(widget) for widget in (self.time_slider, self.latitude_slider, self.longitude_slider,
+                                                          self.density_slider, self.transition_slider, self.render_combo,
+                                                          self.frame_slider)]
+        try:
+            yield
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
 
     def show_warning(self, message):
         QMessageBox.warning(self, "Warning", message)
@@ -509,7 +818,11 @@ class MainWindow(QMainWindow):
         elif not is_mp4 and not file_path.endswith('.gif'):
             file_path += '.gif'
 
-        frames = []
+        # Apply keyframe frame edits that are still waiting for their timer
+        if self._timeline_update_timer.isActive():
+            self._timeline_update_timer.stop()
+            self._commit_timeline_update()
+
         fps = self.timeline.framerate
         duration = int(1000 / fps)
         total_frames = self.timeline.end_frame - self.timeline.start_frame + 1
@@ -520,19 +833,24 @@ class MainWindow(QMainWindow):
         progress.setWindowTitle("Saving Animation")
         progress.setMinimumDuration(0)
         
-        # Generate each frame
-        for frame in range(self.timeline.start_frame, self.timeline.end_frame + 1):
-            if progress.wasCanceled():
-                return
-                
-            state = self.timeline.get_state_at_frame(frame)
-            if state:
-                generator = TwilightGenerator(state)
-                frames.append(generator.get_image())
-                
-                current_frame = frame - self.timeline.start_frame + 1
-                progress.setValue(current_frame)
-                progress.setLabelText(f"Generating frame {current_frame} of {total_frames}")
+        # Generate the frames in a background thread, keeping the UI responsive until it has finished
+        render_thread = FrameRenderThread(self.timeline, self)
+        render_loop = QEventLoop()
+        def on_progress(current_frame):
+            progress.setValue(current_frame)
+            progress.setLabelText(f"Generating frame {current_frame} of {total_frames}")
+        render_thread.progress.connect(on_progress)
+        render_thread.finished.connect(render_loop.quit)
+        progress.canceled.connect(render_thread.cancel)
+        render_thread.start()
+        render_loop.exec()
+        render_thread.wait()
+        # Take the frames and release the thread, so neither outlives this export (also when cancelled or failing below)
+        frames, cancelled = render_thread.frames, render_thread.cancelled
+        render_thread.frames = []
+        render_thread.deleteLater()
+        if cancelled:
+            return
         
         # Before saving, update progress dialog for save phase
         progress.setLabelText("Saving animation to file...")
@@ -610,12 +928,21 @@ class MainWindow(QMainWindow):
         progress.setLabelText("Done!")
         QTimer.singleShot(1000, progress.close)
 
+    def resizeEvent(self, event):
+        # Drop the cached background so it is rebuilt at the new label size
+        self._bg_pixmap = None
+        self.generator_thread.set_target_size(self.image_label.width(), self.image_label.height())
+        super().resizeEvent(event)
+
     def closeEvent(self, event):
         if self.animation_thread and self.animation_thread.isRunning():
             self.animation_thread.stop()
             self.animation_thread.wait()
         self.generator_thread.stop()
         self.generator_thread.wait()
+        if self._thumbnail_thread is not None:
+            self._thumbnail_thread.cancel()
+            self._thumbnail_thread.wait()
         event.accept()
 
 
@@ -1,4 +1,3 @@
-import math
 import random
 
 def clamp(value, min_value, max_value):
@@ -10,17 +9,14 @@ def lerp(a, b, t):
     return (1 - t) * a + t * b
 
 def slerp(a, b, t):
-    """Spherical linear interpolation between a and b with t in [0,1]."""
-    t = clamp(t, 0.0, 1.0)
-    # Calculate the shortest angular difference
-    diff = (b - a) % 360
-    if diff > 180:
-        b = a - (360 - diff)
-    theta_0 = math.radians(a)
-    theta_1 = math.radians(b)
-    delta = theta_1 - theta_0
-    theta = theta_0 + delta * t
-    return math.degrees(theta % (2 * math.pi))
+    """
+    Spherical linear interpolation between a and b (in degrees) with t in [0,1], always along the shorter arc,
+    whatever range a and b are given in. Returns degrees in [0, 360).
+    """
+    t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t # Inline clamp
+    # Shortest angular difference in (-180, 180], a half turn goes forward
+    delta = 180 - (180 - (b - a)) % 360
+    return (a + delta * t) % 360
 
 def lerp_color(color_start, color_end, t):
     """
@@ -67,6 +63,28 @@ def lerp_color(color_start, color_end, t):
         int(lerp(color_start[2], color_end[2], t))
     )
 
+def lerp_colors(color_start, color_end, ts):
+    """
+    Linearly interpolates between two RGB/RGBA colors for many values of t at once.
+    Same results as calling lerp_color() for each t, without the per-call overhead for RGB colors.
+
+    Parameters:
+    - color_start (tuple): Starting RGB/RGBA color.
+    - color_end (tuple): Ending RGB/RGBA color.
+    - ts (iterable of float): Interpolation factors between 0 and 1.
+
+    Returns:
+    - list of tuple: Interpolated colors, in the order of ts.
+    """
+    if len(color_start) != 3 or len(color_end) != 3:
+        return [lerp_color(color_start, color_end, t) for t in ts]
+    r0, g0, b0 = color_start
+    r1, g1, b1 = color_end
+    return [
+        (int((1 - t) * r0 + t * r1), int((1 - t) * g0 + t * g1), int((1 - t) * b0 + t * b1))
+        for t in ts
+    ]
+
 def random_color_variation(base_color, variation=30):
     """
     Adds a random variation to a base color.